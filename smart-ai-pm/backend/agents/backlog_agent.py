@@ -4,6 +4,7 @@ import sys
 import re
 from pathlib import Path
 from typing import List, Dict
+from collections import Counter
 from datetime import datetime, timedelta
 
 # Add backend directory to path for imports
@@ -16,110 +17,219 @@ from models.schemas import Epic, Story, BacklogResponse
 # Check if OpenAI API key is available
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
-def extract_keywords(summary: str, epic_theme: str) -> List[str]:
-    """Extract relevant keywords from summary for stories"""
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', summary.lower())
-    
-    # Theme-specific keyword matching
-    theme_keywords = {
-        'auth': ['login', 'register', 'user', 'account', 'security', 'authentication'],
-        'product': ['product', 'catalog', 'search', 'browse', 'item', 'inventory'],
-        'cart': ['cart', 'checkout', 'payment', 'order', 'buy', 'purchase'],
-        'data': ['data', 'database', 'api', 'integration', 'sync', 'storage'],
-        'ui': ['interface', 'design', 'ui', 'ux', 'layout', 'responsive'],
-        'mobile': ['mobile', 'app', 'ios', 'android', 'native'],
-        'ai': ['ai', 'machine', 'learning', 'model', 'prediction', 'neural'],
-        'chat': ['chat', 'bot', 'conversation', 'message', 'support']
-    }
-    
-    for theme, keywords in theme_keywords.items():
+# Theme-specific keyword matching
+THEME_KEYWORDS = {
+    'auth': ['login', 'register', 'user', 'account', 'security', 'authentication'],
+    'product': ['product', 'catalog', 'search', 'browse', 'item', 'inventory'],
+    'cart': ['cart', 'checkout', 'payment', 'order', 'buy', 'purchase'],
+    'data': ['data', 'database', 'api', 'integration', 'sync', 'storage'],
+    'ui': ['interface', 'design', 'ui', 'ux', 'layout', 'responsive'],
+    'mobile': ['mobile', 'app', 'ios', 'android', 'native'],
+    'ai': ['ai', 'machine', 'learning', 'model', 'prediction', 'neural'],
+    'chat': ['chat', 'bot', 'conversation', 'message', 'support']
+}
+
+# Fallback: generic stories based on common words
+COMMON_WORDS = ['feature', 'system', 'functionality', 'module', 'component']
+
+# Dynamic epic detection based on project type (first matching pattern wins)
+EPIC_TEMPLATES = {
+    # E-commerce keywords
+    r"ecommerce|shop|store|cart|payment|product|buy|purchase|order|checkout": [
+        "User Authentication & Security",
+        "Product Catalog & Search",
+        "Shopping Cart & Checkout",
+        "Order Management & Admin"
+    ],
+    # Mobile app keywords
+    r"mobile|app|ios|android|native|phone": [
+        "Onboarding & User Flow",
+        "Core Features & Navigation",
+        "User Profile & Settings",
+        "Push Notifications & Analytics"
+    ],
+    # Web app keywords
+    r"web|website|dashboard|portal|browser": [
+        "User Interface & Navigation",
+        "Core Business Logic",
+        "Data Management & APIs",
+        "Admin Panel & Reporting"
+    ],
+    # AI/ML keywords
+    r"ai|ml|machine learning|prediction|neural|model|training": [
+        "Data Pipeline & Processing",
+        "Model Training & Deployment",
+        "API & Integration Layer",
+        "Monitoring & Retraining"
+    ],
+    # Chatbot keywords
+    r"chat|bot|chatbot|conversation|message|support|assistant": [
+        "Conversation Engine & NLP",
+        "Integration & APIs",
+        "User Interface & UX",
+        "Analytics & Monitoring"
+    ],
+    # Fitness/health keywords
+    r"fitness|health|workout|exercise|tracker|monitor": [
+        "User Onboarding & Profile",
+        "Tracking & Analytics",
+        "Social Features & Sharing",
+        "Notifications & Reminders"
+    ]
+}
+DEFAULT_EPICS = ["Core Functionality", "Integration & APIs", "User Interface & UX", "Testing & Deployment"]
+
+# Longest literal in EPIC_TEMPLATES is "machine learning" - keep enough text to match across chunks
+PATTERN_OVERLAP = 16
+# Words longer than this are never carried over between chunks
+MAX_WORD_LENGTH = 256
+WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+# extract_keywords only ever picks words containing one of these, so only they are kept
+CANDIDATE_RE = re.compile("|".join(
+    re.escape(kw) for kw in sorted({kw for kws in THEME_KEYWORDS.values() for kw in kws} | set(COMMON_WORDS))
+))
+# Raw word counts are filtered down to candidates whenever they reach this many distinct words
+RAW_VOCABULARY_LIMIT = 50000
+
+
+class KeywordStats:
+    """Word frequencies and matched epic templates for a project document"""
+
+    def __init__(self, counts: Counter = None, matched_templates: List[str] = None):
+        self.counts = counts if counts is not None else Counter()
+        self.matched_templates = set(matched_templates or [])
+        self._ranked = None
+
+    @classmethod
+    def from_text(cls, text: str) -> "KeywordStats":
+        accumulator = KeywordAccumulator()
+        accumulator.feed(text)
+        return accumulator.finish()
+
+    def ranked_words(self) -> List[str]:
+        """Words by frequency, ties broken by first appearance"""
+        if self._ranked is None:
+            self._ranked = [w for w, _ in self.counts.most_common()]
+        return self._ranked
+
+    def top_words(self, keywords: List[str], limit: int) -> List[str]:
+        """Most frequent words containing any of the keywords"""
+        found = []
+        for word in self.ranked_words():
+            if any(kw in word for kw in keywords):
+                found.append(word)
+                if len(found) == limit:
+                    break
+        return found
+
+    def epic_names(self) -> List[str]:
+        for pattern, names in EPIC_TEMPLATES.items():
+            if pattern in self.matched_templates:
+                return names
+        return DEFAULT_EPICS
+
+    def to_json(self) -> str:
+        """Serialize only the words extract_keywords can ever pick"""
+        keep = set()
+        for keywords in THEME_KEYWORDS.values():
+            keep.update(self.top_words(keywords, 4))
+        keep.update(self.top_words(COMMON_WORDS, 3))
+        words = [[w, self.counts[w]] for w in self.ranked_words() if w in keep]
+        return json.dumps({"words": words, "templates": sorted(self.matched_templates)})
+
+    @classmethod
+    def from_json(cls, data: str) -> "KeywordStats":
+        parsed = json.loads(data)
+        return cls(Counter(dict(parsed["words"])), parsed["templates"])
+
+
+class KeywordAccumulator:
+    """Single-pass tokenizer that builds KeywordStats from streamed text chunks"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.matched_templates = set()
+        self._raw = Counter()
+        self._carry = ""
+        self._tail = ""
+
+    def feed(self, chunk: str):
+        chunk = chunk.lower()
+
+        # Epic templates are plain regexes, so match them with a little overlap between chunks.
+        # Only templates ahead of the best match so far can still change the outcome.
+        window = self._tail + chunk
+        for pattern in EPIC_TEMPLATES:
+            if pattern in self.matched_templates:
+                break
+            if re.search(pattern, window):
+                self.matched_templates.add(pattern)
+                break
+        self._tail = window[-PATTERN_OVERLAP:]
+
+        # Hold back a trailing partial word until the next chunk arrives
+        text = self._carry + chunk
+        cut = len(text)
+        while cut > 0 and (text[cut - 1].isalnum() or text[cut - 1] == "_"):
+            cut -= 1
+        self._carry = text[cut:]
+        if len(self._carry) > MAX_WORD_LENGTH:
+            # Still inside an over-long word: a word character keeps its rest from matching
+            self._carry = "_"
+        self._count(text[:cut])
+
+    def finish(self) -> KeywordStats:
+        self._count(self._carry)
+        self._carry = ""
+        self._flush()
+        return KeywordStats(self.counts, list(self.matched_templates))
+
+    def _count(self, text: str):
+        # Counting every word stays in C; the per-word candidate check only runs per distinct word
+        self._raw.update(WORD_RE.findall(text))
+        if len(self._raw) >= RAW_VOCABULARY_LIMIT:
+            self._flush()
+
+    def _flush(self):
+        # Dropped words can never be picked, so filtering keeps the candidate counts exact
+        for word, count in self._raw.items():
+            if CANDIDATE_RE.search(word):
+                self.counts[word] += count
+        self._raw.clear()
+
+
+def extract_keywords(stats: KeywordStats, epic_theme: str) -> List[str]:
+    """Extract relevant keywords from summary word counts for stories"""
+    for theme, keywords in THEME_KEYWORDS.items():
         if theme in epic_theme.lower():
-            relevant = [w.capitalize() for w in words if any(kw in w for kw in keywords)]
+            relevant = [w.capitalize() for w in stats.top_words(keywords, 4)]
             if relevant:
-                return relevant[:4]
-    
-    # Fallback: generic stories based on common words
-    common_words = ['feature', 'system', 'functionality', 'module', 'component']
-    found = [w.capitalize() for w in words if any(cw in w for cw in common_words)]
+                return relevant
+
+    found = [w.capitalize() for w in stats.top_words(COMMON_WORDS, 3)]
     if found:
-        return found[:3]
-    
+        return found
+
     # Ultimate fallback
     return ["Core implementation", "Testing & validation", "Documentation"]
 
 def smart_generate_backlog(project_summary: str) -> BacklogResponse:
     """AI-powered backlog generation - WORKS FOR ANY PROJECT SUMMARY"""
-    
+    return smart_generate_backlog_from_stats(KeywordStats.from_text(project_summary))
+
+def smart_generate_backlog_from_stats(stats: KeywordStats) -> BacklogResponse:
+    """Backlog generation from word counts, so documents of any size cost the same"""
+
     # SMART KEYWORD ANALYSIS (No OpenAI needed)
-    summary_lower = project_summary.lower()
-    
-    # Dynamic epic detection based on project type
-    epic_templates = {
-        # E-commerce keywords
-        r"ecommerce|shop|store|cart|payment|product|buy|purchase|order|checkout": [
-            "User Authentication & Security",
-            "Product Catalog & Search", 
-            "Shopping Cart & Checkout",
-            "Order Management & Admin"
-        ],
-        # Mobile app keywords
-        r"mobile|app|ios|android|native|phone": [
-            "Onboarding & User Flow",
-            "Core Features & Navigation",
-            "User Profile & Settings",
-            "Push Notifications & Analytics"
-        ],
-        # Web app keywords
-        r"web|website|dashboard|portal|browser": [
-            "User Interface & Navigation",
-            "Core Business Logic", 
-            "Data Management & APIs",
-            "Admin Panel & Reporting"
-        ],
-        # AI/ML keywords
-        r"ai|ml|machine learning|prediction|neural|model|training": [
-            "Data Pipeline & Processing",
-            "Model Training & Deployment",
-            "API & Integration Layer",
-            "Monitoring & Retraining"
-        ],
-        # Chatbot keywords
-        r"chat|bot|chatbot|conversation|message|support|assistant": [
-            "Conversation Engine & NLP",
-            "Integration & APIs",
-            "User Interface & UX",
-            "Analytics & Monitoring"
-        ],
-        # Fitness/health keywords
-        r"fitness|health|workout|exercise|tracker|monitor": [
-            "User Onboarding & Profile",
-            "Tracking & Analytics",
-            "Social Features & Sharing",
-            "Notifications & Reminders"
-        ],
-        # Default for any project
-        "default": [
-            "Core Functionality",
-            "Integration & APIs", 
-            "User Interface & UX",
-            "Testing & Deployment"
-        ]
-    }
-    
-    # Find matching epic template
-    epic_names = ["Core Functionality", "Integration & APIs", "User Interface & UX", "Testing & Deployment"]
-    for pattern, names in epic_templates.items():
-        if pattern != "default" and re.search(pattern, summary_lower):
-            epic_names = names
-            break
-    
+    epic_names = stats.epic_names()
+
     # Generate epics dynamically
     epics = []
     story_fibonacci = [1, 2, 3, 5, 8, 13]
-    
+
     for i, epic_name in enumerate(epic_names[:4]):
         # Dynamic stories based on epic name + summary keywords
-        base_stories = extract_keywords(project_summary, epic_name)
+        base_stories = extract_keywords(stats, epic_name)
         
         # Generate story titles with points
         story_titles = []
@@ -234,3 +344,16 @@ def generate_backlog(project_summary: str) -> BacklogResponse:
         print(f"Error generating backlog: {e}")
         # Fallback to mock
         return mock_generate_backlog(project_summary)
+
+def generate_backlog_from_stats(stats: KeywordStats) -> BacklogResponse:
+    """
+    Generate backlog from pre-computed keyword stats (e.g. an uploaded document)
+    Input: KeywordStats built by KeywordAccumulator
+    Output: BacklogResponse with Epics, Stories, Story Points, Sprints
+    """
+    try:
+        return smart_generate_backlog_from_stats(stats)
+    except Exception as e:
+        print(f"Error generating backlog: {e}")
+        # Fallback to mock
+        return mock_generate_backlog("")
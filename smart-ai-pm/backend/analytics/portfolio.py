@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from models.schemas import SprintRollup, ThemeRollup, TimelineBucket, PortfolioAnalytics
+
+# Safety net for writes made by other worker processes, which can't invalidate our cache
+ANALYTICS_CACHE_TTL = float(os.getenv("ANALYTICS_CACHE_TTL", "60"))
+
+_lock = threading.Lock()
+_version = 0
+_cache = {"version": -1, "expires": 0.0, "data": None}
+
+
+def invalidate_analytics():
+    """Drop cached rollups - call after any write to projects or epics"""
+    global _version
+    with _lock:
+        _version += 1
+
+
+def init_rollups(conn):
+    """Create the rollup tables behind /analytics, backfilling them from existing epics"""
+    c = conn.cursor()
+    # Workers starting together would otherwise all see empty rollups and backfill twice
+    conn.commit()
+    c.execute("BEGIN IMMEDIATE")
+    # Sprint/title of NULL are stored as 0/'' so every bucket has a usable key
+    c.execute('''CREATE TABLE IF NOT EXISTS rollup_sprints
+                 (sprint INTEGER PRIMARY KEY, epics INTEGER, projects INTEGER, story_points INTEGER)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS rollup_themes
+                 (title TEXT PRIMARY KEY, epics INTEGER, story_points INTEGER)''')
+    # Number of projects whose backlog ends in a given sprint
+    c.execute('''CREATE TABLE IF NOT EXISTS rollup_timeline
+                 (sprints INTEGER PRIMARY KEY, projects INTEGER)''')
+
+    # Checked under the write lock, so only the first worker backfills
+    c.execute("SELECT EXISTS(SELECT 1 FROM rollup_sprints), EXISTS(SELECT 1 FROM epics)")
+    has_rollups, has_epics = c.fetchone()
+    if has_epics and not has_rollups:
+        # One-off full scan for databases created before the rollups existed
+        c.execute('''INSERT INTO rollup_sprints
+                     SELECT COALESCE(sprint, 0), COUNT(*), COUNT(DISTINCT project_id),
+                            COALESCE(SUM(total_story_points), 0)
+                     FROM epics GROUP BY COALESCE(sprint, 0)''')
+        c.execute('''INSERT INTO rollup_themes
+                     SELECT COALESCE(title, ''), COUNT(*), COALESCE(SUM(total_story_points), 0)
+                     FROM epics GROUP BY COALESCE(title, '')''')
+        c.execute('''INSERT INTO rollup_timeline
+                     SELECT sprints, COUNT(*) FROM
+                       (SELECT COALESCE(MAX(sprint), 0) AS sprints FROM epics GROUP BY project_id)
+                     GROUP BY sprints''')
+    conn.commit()
+
+
+def record_epic(c, project_id: int, title: str, story_points: int, sprint: int):
+    """Update the rollups for an epic about to be inserted.
+
+    Call with the same cursor, before the epics INSERT and inside the same
+    transaction. The "before" lookups go through the (project_id, sprint) index.
+    """
+    sprint = sprint or 0
+    story_points = story_points or 0
+
+    c.execute("SELECT EXISTS(SELECT 1 FROM epics WHERE project_id = ? AND COALESCE(sprint, 0) = ?)",
+              (project_id, sprint))
+    new_project_in_sprint = 0 if c.fetchone()[0] else 1
+    c.execute('''INSERT INTO rollup_sprints (sprint, epics, projects, story_points) VALUES (?, 1, ?, ?)
+                 ON CONFLICT(sprint) DO UPDATE SET epics = epics + 1,
+                     projects = projects + excluded.projects,
+                     story_points = story_points + excluded.story_points''',
+              (sprint, new_project_in_sprint, story_points))
+
+    c.execute('''INSERT INTO rollup_themes (title, epics, story_points) VALUES (?, 1, ?)
+                 ON CONFLICT(title) DO UPDATE SET epics = epics + 1,
+                     story_points = story_points + excluded.story_points''',
+              (title or "", story_points))
+
+    # Move the project to its new timeline bucket if this epic extends its backlog
+    c.execute("SELECT COUNT(*), COALESCE(MAX(sprint), 0) FROM epics WHERE project_id = ?", (project_id,))
+    existing, old_sprints = c.fetchone()
+    if existing and sprint <= old_sprints:
+        return
+    if existing:
+        c.execute("UPDATE rollup_timeline SET projects = projects - 1 WHERE sprints = ?", (old_sprints,))
+        c.execute("DELETE FROM rollup_timeline WHERE sprints = ? AND projects <= 0", (old_sprints,))
+    c.execute('''INSERT INTO rollup_timeline (sprints, projects) VALUES (?, 1)
+                 ON CONFLICT(sprints) DO UPDATE SET projects = projects + 1''', (sprint,))
+
+
+def compute_portfolio_analytics(conn) -> PortfolioAnalytics:
+    """Read portfolio analytics from the rollup tables maintained by record_epic"""
+    c = conn.cursor()
+
+    c.execute("SELECT COUNT(*) FROM projects")
+    total_projects = c.fetchone()[0]
+
+    c.execute("SELECT sprint, epics, projects, story_points FROM rollup_sprints ORDER BY sprint")
+    per_sprint = [SprintRollup(sprint=sprint, epics=epics, projects=projects, story_points=points)
+                  for sprint, epics, projects, points in c.fetchall()]
+
+    c.execute("SELECT title, epics, story_points FROM rollup_themes ORDER BY epics DESC, title")
+    themes = [ThemeRollup(theme=title, epics=epics, story_points=points)
+              for title, epics, points in c.fetchall()]
+
+    # Same timeline rule as the per-project backlog: last sprint × 2 weeks
+    c.execute("SELECT sprints, projects FROM rollup_timeline ORDER BY sprints")
+    timeline = [TimelineBucket(sprints=sprints, weeks=sprints * 2, projects=projects)
+                for sprints, projects in c.fetchall()]
+
+    return PortfolioAnalytics(
+        total_projects=total_projects,
+        projects_with_backlog=sum(b.projects for b in timeline),
+        total_epics=sum(s.epics for s in per_sprint),
+        total_story_points=sum(s.story_points for s in per_sprint),
+        story_points_per_sprint=per_sprint,
+        theme_distribution=themes,
+        timeline_histogram=timeline,
+        generated_at=datetime.now().isoformat()
+    )
+
+
+def get_portfolio_analytics(get_connection) -> dict:
+    """Return cached rollups, recomputing only after a write or TTL expiry"""
+    with _lock:
+        version = _version
+        if _cache["version"] == version and time.monotonic() < _cache["expires"]:
+            return _cache["data"]
+
+    conn = get_connection()
+    try:
+        data = compute_portfolio_analytics(conn).dict()
+    finally:
+        conn.close()
+
+    with _lock:
+        # A write that landed while computing leaves the result stale, so don't cache it
+        if _version == version:
+            _cache.update(version=version, expires=time.monotonic() + ANALYTICS_CACHE_TTL, data=data)
+    return data
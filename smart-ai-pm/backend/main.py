@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -7,18 +8,32 @@ if str(backend_dir) not in sys.path:
     sys.path.insert(0, str(backend_dir))
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, Response, HTTPException, Query, File, Form, UploadFile
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
 from pydantic import BaseModel
 import sqlite3
 import json
+import time
+import codecs
 from datetime import datetime
-from agents.backlog_agent import generate_backlog
+from typing import Optional
+from agents.backlog_agent import generate_backlog, generate_backlog_from_stats, KeywordStats, KeywordAccumulator
+from analytics.portfolio import get_portfolio_analytics, invalidate_analytics, init_rollups, record_epic
+from profiling.sampler import (
+    PROFILING_ENABLED, PROFILING_SLOW_MS,
+    SamplingProfiler, admin_token_valid, profile_requested, sample_request,
+    write_profile, list_profiles, profile_path
+)
 
 # Get project root directory (parent of backend/)
 PROJECT_ROOT = Path(__file__).parent.parent
 DB_DIR = PROJECT_ROOT / "data"
 DB_PATH = DB_DIR / "smart_pm.db"
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(DB_DIR / "profiles")))
+# Uploaded documents are read in chunks of this size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Only this much of an uploaded document is stored as the project summary
+SUMMARY_EXCERPT_CHARS = 2000
 
 # Inline DB (no external imports needed)
 def init_db():
@@ -30,6 +45,10 @@ def init_db():
     c.execute('''CREATE TABLE IF NOT EXISTS projects 
                  (id INTEGER PRIMARY KEY AUTOINCREMENT, 
                   name TEXT, summary TEXT, created_at TEXT)''')
+    # Keyword counts for projects created from an uploaded document
+    c.execute("PRAGMA table_info(projects)")
+    if "keyword_stats" not in [col[1] for col in c.fetchall()]:
+        c.execute("ALTER TABLE projects ADD COLUMN keyword_stats TEXT")
     # Epics table
     c.execute('''CREATE TABLE IF NOT EXISTS epics 
                  (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -40,7 +59,10 @@ def init_db():
                   sprint INTEGER,
                   created_at TEXT,
                   FOREIGN KEY (project_id) REFERENCES projects(id))''')
+    # Serves per-project backlog lookups and the rollup bookkeeping in record_epic
+    c.execute("CREATE INDEX IF NOT EXISTS idx_epics_project_sprint ON epics (project_id, sprint)")
     conn.commit()
+    init_rollups(conn)
     conn.close()
 
 def get_db_connection():
@@ -57,6 +79,31 @@ async def lifespan(app: FastAPI):
 
 app = FastAPI(lifespan=lifespan)
 
+async def profile_requests(request: Request, call_next):
+    """Capture a sampling profile for requests that ask for one or are sampled and slow"""
+    requested = profile_requested(request.headers, request.query_params)
+    if not requested and not sample_request():
+        return await call_next(request)
+    
+    profiler = SamplingProfiler().start()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.stop()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    # Automatically sampled requests are only kept when they were slow
+    if requested or elapsed_ms >= PROFILING_SLOW_MS:
+        name = write_profile(PROFILE_DIR, profiler, request.method, request.url.path, elapsed_ms)
+        if name:
+            response.headers["X-Profile-Id"] = name
+    return response
+
+# Only install the middleware when profiling is enabled so it costs nothing otherwise
+if PROFILING_ENABLED:
+    app.middleware("http")(profile_requests)
+
 class Project(BaseModel):
     name: str
     summary: str
@@ -125,7 +172,20 @@ async def home(request: Request):
     .pulse{animation:pulse 2s infinite;}
     @keyframes pulse{0%,100%{opacity:1;}50%{opacity:0.5;}}
     .loading-text{font-size:1.2rem;color:#667eea;font-weight:600;margin-top:15px;}
-    @media(max-width:768px){.header h1{font-size:2rem;}.card{padding:20px;}.action-buttons{flex-direction:column;width:100%;}button{width:100%;margin:5px 0;}}
+    .table-viewport{max-height:640px;overflow-y:auto;margin-top:25px;border-radius:15px;box-shadow:0 4px 15px rgba(0,0,0,0.1);}
+    .table-viewport table{margin-top:0;overflow:visible;box-shadow:none;table-layout:fixed;}
+    .table-viewport th{position:sticky;top:0;z-index:1;}
+    .vrow td{height:80px;padding:0 18px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;}
+    .vrow .action-buttons{flex-wrap:nowrap;}
+    .spacer td{padding:0;border:none;background:transparent;}
+    .table-status{color:#666;margin-top:12px;font-size:0.95rem;}
+    .brow td{height:180px;vertical-align:top;overflow:hidden;}
+    .story-scroll{max-height:140px;overflow-y:auto;}
+    body.reduced-motion{animation:none;}
+    body.reduced-motion .bg-particles{display:none;}
+    body.reduced-motion .header,body.reduced-motion .card,body.reduced-motion .header-icon,body.reduced-motion .modal-content{animation:none;backdrop-filter:none;transition:none;}
+    body.reduced-motion .card:hover,body.reduced-motion tr:hover td,body.reduced-motion .story-item:hover{transform:none;transition:none;}
+    @media(max-width:768px){.header h1{font-size:2rem;}.card{padding:20px;}.action-buttons{flex-direction:column;width:100%;}button{width:100%;margin:5px 0;}.vrow .action-buttons{flex-direction:row;}.vrow button{width:auto;}}
     </style>
     </head>
     <body>
@@ -149,11 +209,15 @@ async def home(request: Request):
     
     <div class="card">
     <h2><span>📁</span>Your Projects</h2>
+    <div class="table-viewport" id="projectsViewport">
     <table id="projectsTable">
+        <colgroup><col style="width:80px;"><col style="width:20%;"><col><col style="width:200px;"><col style="width:380px;"></colgroup>
         <thead><tr><th>#</th><th>📁 Name</th><th>📄 Summary</th><th>📅 Created</th><th>⚡ Actions</th></tr></thead>
         <tbody></tbody>
     </table>
     </div>
+    <div class="table-status" id="projectsStatus"></div>
+    </div>
     </div>
     
     <div id="backlogModal" class="modal">
@@ -171,18 +235,31 @@ async def home(request: Request):
                 <thead><tr><th>🎯 Epic</th><th>📝 Stories</th><th>📊 Points</th><th>🏃 Sprint</th></tr></thead>
                 <tbody id="backlogTableBody"></tbody>
             </table>
+            <div class="table-status" id="backlogStatus"></div>
         </div>
     </div>
     </div>
 
     <script>
     function escapeHtml(text) {
-        const div = document.createElement('div');
-        div.textContent = text;
-        return div.innerHTML;
+        // Also escapes quotes so the result is safe inside attribute values
+        return String(text ?? '').replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
     }
     
+    const PROJECT_PAGE_SIZE = 100;
+    const PROJECT_ROW_HEIGHT = 80;
+    const OVERSCAN_ROWS = 10;
+    const EPIC_PAGE_SIZE = 50;
+    const EPIC_ROW_HEIGHT = 180;
+    const STORY_PREVIEW = 10;
+    const LARGE_LIST_ROWS = 500;
+
+    let particlesCreated = false;
+
     function createParticles() {
+        if(particlesCreated) return;
+        particlesCreated = true;
         const particlesContainer = document.getElementById('particles');
         for(let i = 0; i < 50; i++) {
             const particle = document.createElement('div');
@@ -193,97 +270,273 @@ async def home(request: Request):
             particlesContainer.appendChild(particle);
         }
     }
-    
-    createParticles();
 
-    async function loadProjects() {
-        const res = await fetch('/projects');
-        const projects = await res.json();
-        const tbody = document.querySelector('#projectsTable tbody');
-        if(projects.length === 0) {
-            tbody.innerHTML = '<tr><td colspan="5" style="text-align:center;padding:40px;color:#999;"><div style="font-size:3rem;margin-bottom:15px;">📭</div><p>No projects yet. Create your first project above!</p></td></tr>';
+    function updateDecorations() {
+        // Decorative animations make scrolling stutter once tables get large
+        const rows = Math.max(projectTotal, backlogState ? backlogState.total : 0);
+        const large = rows > LARGE_LIST_ROWS;
+        document.body.classList.toggle('reduced-motion', large);
+        if(large) {
+            document.getElementById('particles').innerHTML = '';
+            particlesCreated = false;
+        } else {
+            createParticles();
+        }
+    }
+
+    // Projects table: only the visible window of rows is rendered, pages are fetched on demand
+    let projectTotal = 0;
+    let projectPages = new Map();
+    let projectGeneration = 0;
+    let projectRenderQueued = false;
+
+    async function fetchProjectPage(page) {
+        if(projectPages.has(page)) return;
+        const generation = projectGeneration;
+        projectPages.set(page, null);
+        try {
+            const res = await fetch('/projects?offset=' + (page * PROJECT_PAGE_SIZE) + '&limit=' + PROJECT_PAGE_SIZE);
+            const projects = await res.json();
+            if(generation !== projectGeneration) return;
+            projectTotal = parseInt(res.headers.get('X-Total-Count') || projects.length, 10);
+            projectPages.set(page, projects);
+        } catch (error) {
+            console.error('Error loading projects:', error);
+            if(generation === projectGeneration) projectPages.delete(page);
             return;
         }
-        tbody.innerHTML = projects.map(p => 
-            `<tr>
+        scheduleProjectRender();
+    }
+
+    async function loadProjects() {
+        projectGeneration++;
+        projectPages = new Map();
+        document.getElementById('projectsViewport').scrollTop = 0;
+        await fetchProjectPage(0);
+        updateDecorations();
+    }
+
+    function scheduleProjectRender() {
+        if(projectRenderQueued) return;
+        projectRenderQueued = true;
+        requestAnimationFrame(() => {
+            projectRenderQueued = false;
+            renderProjectWindow();
+        });
+    }
+
+    function spacerRow(height, columns = 5) {
+        return height > 0 ? '<tr class="spacer" style="height:' + height + 'px;"><td colspan="' + columns + '"></td></tr>' : '';
+    }
+
+    function projectRow(p) {
+        return `<tr class="vrow">
                 <td><strong style="color:#667eea;font-size:1.2rem;">${p.id}</strong></td>
                 <td><strong style="font-size:1.1rem;color:#333;">${escapeHtml(p.name)}</strong></td>
-                <td style="max-width:400px;">${escapeHtml(p.summary)}</td>
+                <td title="${escapeHtml(p.summary)}">${escapeHtml(p.summary)}</td>
                 <td>${new Date(p.created_at).toLocaleString()}</td>
                 <td>
                     <div class="action-buttons">
-                        <button class="btn-sm btn-success" onclick="generateBacklog(${p.id}, '${escapeHtml(p.name).replace(/'/g, "\\'")}')">
+                        <button class="btn-sm btn-success" onclick="generateBacklog(${p.id})">
                             ✨ Generate Backlog
                         </button>
-                        <button class="btn-sm" onclick="viewBacklog(${p.id}, '${escapeHtml(p.name).replace(/'/g, "\\'")}')">
+                        <button class="btn-sm" onclick="viewBacklog(${p.id})">
                             📋 View Backlog
                         </button>
                     </div>
                 </td>
-            </tr>`
-        ).join('');
+            </tr>`;
+    }
+
+    function projectName(projectId) {
+        // Handlers only get the id, so names never pass through inline JavaScript
+        for(const projects of projectPages.values()) {
+            const p = projects && projects.find(p => p.id === projectId);
+            if(p) return p.name;
+        }
+        return 'Project #' + projectId;
+    }
+
+    function renderProjectWindow() {
+        const tbody = document.querySelector('#projectsTable tbody');
+        const status = document.getElementById('projectsStatus');
+        if(projectTotal === 0) {
+            tbody.innerHTML = '<tr><td colspan="5" style="text-align:center;padding:40px;color:#999;"><div style="font-size:3rem;margin-bottom:15px;">📭</div><p>No projects yet. Create your first project above!</p></td></tr>';
+            status.textContent = '';
+            return;
+        }
+        const viewport = document.getElementById('projectsViewport');
+        const first = Math.max(0, Math.floor(viewport.scrollTop / PROJECT_ROW_HEIGHT) - OVERSCAN_ROWS);
+        const last = Math.min(projectTotal, Math.ceil((viewport.scrollTop + viewport.clientHeight) / PROJECT_ROW_HEIGHT) + OVERSCAN_ROWS);
+        const rows = [];
+        for(let i = first; i < last; i++) {
+            const projects = projectPages.get(Math.floor(i / PROJECT_PAGE_SIZE));
+            const p = projects && projects[i % PROJECT_PAGE_SIZE];
+            if(!projects) fetchProjectPage(Math.floor(i / PROJECT_PAGE_SIZE));
+            rows.push(p ? projectRow(p) : '<tr class="vrow"><td colspan="5" style="color:#999;">Loading…</td></tr>');
+        }
+        tbody.innerHTML = spacerRow(first * PROJECT_ROW_HEIGHT) + rows.join('') + spacerRow((projectTotal - last) * PROJECT_ROW_HEIGHT);
+        status.textContent = 'Showing ' + (first + 1) + '–' + last + ' of ' + projectTotal + ' projects';
     }
 
-    async function generateBacklog(projectId, projectName) {
-        document.getElementById('modalProjectName').textContent = projectName + ' - Generating Backlog...';
+    document.getElementById('projectsViewport').addEventListener('scroll', scheduleProjectRender, {passive: true});
+
+    async function generateBacklog(projectId) {
+        const name = projectName(projectId);
+        document.getElementById('modalProjectName').textContent = name + ' - Generating Backlog...';
         document.getElementById('backlogModal').style.display = 'block';
         document.getElementById('backlogLoading').style.display = 'block';
         document.getElementById('backlogContent').style.display = 'none';
-        
+        const state = startBacklog(projectId);
+
         try {
             const res = await fetch('/generate-backlog/' + projectId, {method: 'POST'});
             const backlog = await res.json();
-            displayBacklog(backlog, projectName);
+            // The modal may have been closed or switched to another project meanwhile
+            if(state !== backlogState) return;
+            displayBacklog(backlog, name);
         } catch (error) {
             console.error('Error generating backlog:', error);
+            if(state !== backlogState) return;
             document.getElementById('backlogLoading').innerHTML = '<p style="color:red;">Error generating backlog. Please try again.</p>';
         }
     }
 
-    async function viewBacklog(projectId, projectName) {
-        document.getElementById('modalProjectName').textContent = projectName + ' - Backlog';
+    async function viewBacklog(projectId) {
+        const name = projectName(projectId);
+        document.getElementById('modalProjectName').textContent = name + ' - Backlog';
         document.getElementById('backlogModal').style.display = 'block';
         document.getElementById('backlogLoading').style.display = 'block';
         document.getElementById('backlogContent').style.display = 'none';
-        
+        const state = startBacklog(projectId);
+
         try {
-            const res = await fetch('/projects/' + projectId + '/backlog');
-            const backlog = await res.json();
-            displayBacklog(backlog, projectName);
+            const backlog = await fetchBacklogPage(state, 0);
+            if(state !== backlogState) return;
+            displayBacklog(backlog, name);
         } catch (error) {
             console.error('Error loading backlog:', error);
+            if(state !== backlogState) return;
             document.getElementById('backlogLoading').innerHTML = '<p>No backlog generated yet. Click "Generate Backlog" to create one.</p>';
         }
     }
 
+    // Backlog modal: windowed like the projects table, epic pages are fetched on demand
+    let backlogState = null;
+    let backlogRenderQueued = false;
+
+    function startBacklog(projectId) {
+        backlogState = {projectId: projectId, pages: new Map(), total: 0, expanded: new Set()};
+        return backlogState;
+    }
+
+    async function fetchBacklogPage(state, page) {
+        const res = await fetch('/projects/' + state.projectId + '/backlog?offset=' + (page * EPIC_PAGE_SIZE) + '&limit=' + EPIC_PAGE_SIZE);
+        if(!res.ok) throw new Error('HTTP ' + res.status);
+        return res.json();
+    }
+
+    async function loadBacklogPage(state, page) {
+        if(state.pages.has(page)) return;
+        state.pages.set(page, null);
+        try {
+            const backlog = await fetchBacklogPage(state, page);
+            if(state !== backlogState) return;
+            state.pages.set(page, backlog.epics);
+            state.total = backlog.total_epics;
+        } catch (error) {
+            console.error('Error loading epics:', error);
+            if(state === backlogState) state.pages.delete(page);
+            return;
+        }
+        scheduleBacklogRender();
+    }
+
     function displayBacklog(backlog, projectName) {
         document.getElementById('backlogLoading').style.display = 'none';
         document.getElementById('backlogContent').style.display = 'block';
         document.getElementById('modalProjectName').textContent = projectName + ' - Backlog';
-        
-        document.getElementById('timelineEstimate').innerHTML = 
+
+        document.getElementById('timelineEstimate').innerHTML =
             '<div style="display:flex;flex-wrap:wrap;gap:20px;align-items:center;">' +
-            '<div><strong>⏱ Timeline:</strong> ' + (backlog.timeline_estimate || 'N/A') + '</div>' +
+            '<div><strong>⏱ Timeline:</strong> ' + escapeHtml(backlog.timeline_estimate || 'N/A') + '</div>' +
             '<div><strong>📊 Story Points:</strong> <span style="color:#667eea;font-size:1.2rem;">' + (backlog.total_story_points || 0) + '</span></div>' +
             '<div><strong>🏃 Sprints:</strong> <span style="color:#764ba2;font-size:1.2rem;">' + (backlog.estimated_sprints || 0) + '</span></div>' +
             '</div>';
-        
+
+        // Generated backlogs arrive whole, stored ones one page at a time
+        backlogState.total = backlog.total_epics ?? backlog.epics.length;
+        for(let i = 0; i < backlog.epics.length; i += EPIC_PAGE_SIZE) {
+            backlogState.pages.set(i / EPIC_PAGE_SIZE, backlog.epics.slice(i, i + EPIC_PAGE_SIZE));
+        }
+        document.querySelector('#backlogModal .modal-content').scrollTop = 0;
+        updateDecorations();
+        renderBacklogWindow();
+    }
+
+    function scheduleBacklogRender() {
+        if(backlogRenderQueued) return;
+        backlogRenderQueued = true;
+        requestAnimationFrame(() => {
+            backlogRenderQueued = false;
+            renderBacklogWindow();
+        });
+    }
+
+    function storyItems(stories) {
+        return stories.map(s =>
+            '<li class="story-item">' + escapeHtml(s.title) + ' <span style="color:#666;">(' + s.story_points + ' pts)</span></li>'
+        ).join('');
+    }
+
+    function epicRow(epic, index) {
+        // Long story lists are collapsed until asked for, and scroll inside their fixed-height cell
+        const expanded = backlogState.expanded.has(index);
+        const stories = expanded ? epic.stories : epic.stories.slice(0, STORY_PREVIEW);
+        const hidden = epic.stories.length - stories.length;
+        const more = hidden > 0 ? '<li><button class="btn-sm" onclick="showAllStories(' + index + ')">Show ' + hidden + ' more stories</button></li>' : '';
+        return '<tr class="brow">' +
+            '<td><strong>' + escapeHtml(epic.title) + '</strong></td>' +
+            '<td><div class="story-scroll"><ul class="story-list">' + storyItems(stories) + more + '</ul></div></td>' +
+            '<td><strong>' + epic.total_story_points + '</strong></td>' +
+            '<td><strong>Sprint ' + epic.sprint + '</strong></td>' +
+            '</tr>';
+    }
+
+    function showAllStories(index) {
+        backlogState.expanded.add(index);
+        renderBacklogWindow();
+    }
+
+    function renderBacklogWindow() {
+        const state = backlogState;
+        if(!state) return;
         const tbody = document.getElementById('backlogTableBody');
-        tbody.innerHTML = backlog.epics.map(epic => {
-            const storiesHtml = epic.stories.map(s => 
-                '<li class="story-item">' + escapeHtml(s.title) + ' <span style="color:#666;">(' + s.story_points + ' pts)</span></li>'
-            ).join('');
-            return '<tr>' +
-                '<td><strong>' + escapeHtml(epic.title) + '</strong></td>' +
-                '<td><ul class="story-list">' + storiesHtml + '</ul></td>' +
-                '<td><strong>' + epic.total_story_points + '</strong></td>' +
-                '<td><strong>Sprint ' + epic.sprint + '</strong></td>' +
-                '</tr>';
-        }).join('');
+        const scroller = document.querySelector('#backlogModal .modal-content');
+        // Rows start below the timeline and the table header inside the scrolling modal
+        const rowsTop = tbody.closest('table').offsetTop + tbody.offsetTop;
+        const scrollTop = Math.max(0, scroller.scrollTop - rowsTop);
+        const first = Math.max(0, Math.floor(scrollTop / EPIC_ROW_HEIGHT) - OVERSCAN_ROWS);
+        const last = Math.min(state.total, Math.ceil((scrollTop + scroller.clientHeight) / EPIC_ROW_HEIGHT) + OVERSCAN_ROWS);
+        const rows = [];
+        for(let i = first; i < last; i++) {
+            const epics = state.pages.get(Math.floor(i / EPIC_PAGE_SIZE));
+            const epic = epics && epics[i % EPIC_PAGE_SIZE];
+            if(!epics) loadBacklogPage(state, Math.floor(i / EPIC_PAGE_SIZE));
+            rows.push(epic ? epicRow(epic, i) : '<tr class="brow"><td colspan="4" style="color:#999;">Loading…</td></tr>');
+        }
+        tbody.innerHTML = spacerRow(first * EPIC_ROW_HEIGHT, 4) + rows.join('') + spacerRow((state.total - last) * EPIC_ROW_HEIGHT, 4);
+        document.getElementById('backlogStatus').textContent = state.total > 0
+            ? 'Showing epics ' + (first + 1) + '–' + last + ' of ' + state.total
+            : 'No epics yet. Click "Generate Backlog" to create some.';
     }
 
+    document.querySelector('#backlogModal .modal-content').addEventListener('scroll', scheduleBacklogRender, {passive: true});
+
     function closeBacklogModal() {
         document.getElementById('backlogModal').style.display = 'none';
+        backlogState = null;
+        updateDecorations();
     }
 
     document.getElementById('projectForm').addEventListener('submit', async (e) => {
@@ -322,13 +575,45 @@ async def create_project(project: Project):
     conn.commit()
     project_id = c.lastrowid
     conn.close()
+    invalidate_analytics()
     return {"id": project_id, "message": "Project created!"}
 
+@app.post("/projects/upload")
+async def upload_project(name: str = Form(...), file: UploadFile = File(...)):
+    """Create a project from a spec document, streamed through the keyword accumulator"""
+    accumulator = KeywordAccumulator()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    excerpt = ""
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        text = decoder.decode(chunk)
+        if len(excerpt) < SUMMARY_EXCERPT_CHARS:
+            excerpt += text[:SUMMARY_EXCERPT_CHARS - len(excerpt)]
+        accumulator.feed(text)
+    accumulator.feed(decoder.decode(b"", final=True))
+    stats = accumulator.finish()
+    
+    conn = get_db_connection()
+    c = conn.cursor()
+    c.execute("INSERT INTO projects (name, summary, created_at, keyword_stats) VALUES (?, ?, ?, ?)",
+              (name, excerpt.strip(), datetime.now().isoformat(), stats.to_json()))
+    conn.commit()
+    project_id = c.lastrowid
+    conn.close()
+    invalidate_analytics()
+    return {"id": project_id, "message": "Project created from document!"}
+
 @app.get("/projects")
-async def list_projects():
+async def list_projects(response: Response,
+                        offset: int = Query(0, ge=0),
+                        limit: Optional[int] = Query(None, ge=1, le=500)):
+    """List projects, newest first - pass offset/limit to fetch one page (total in X-Total-Count)"""
     conn = get_db_connection()
     c = conn.cursor()
-    c.execute("SELECT * FROM projects ORDER BY id DESC")
+    c.execute("SELECT COUNT(*) FROM projects")
+    response.headers["X-Total-Count"] = str(c.fetchone()[0])
+    # LIMIT -1 means no limit in SQLite, so offset applies on its own too
+    c.execute("SELECT * FROM projects ORDER BY id DESC LIMIT ? OFFSET ?",
+              (-1 if limit is None else limit, offset))
     projects = [{"id": row[0], "name": row[1], "summary": row[2], "created_at": row[3]} 
                 for row in c.fetchall()]
     conn.close()
@@ -350,21 +635,28 @@ async def generate_project_backlog(project_id: int):
     """Generate backlog for a project using AI agent"""
     conn = get_db_connection()
     c = conn.cursor()
-    c.execute("SELECT summary FROM projects WHERE id = ?", (project_id,))
+    c.execute("SELECT summary, keyword_stats FROM projects WHERE id = ?", (project_id,))
     row = c.fetchone()
     if not row:
         conn.close()
         raise HTTPException(status_code=404, detail="Project not found")
     
-    project_summary = row[0]
+    project_summary, keyword_stats = row
+    
+    # Generate backlog using agent (uploaded documents only keep their keyword counts)
+    if keyword_stats:
+        backlog_response = generate_backlog_from_stats(KeywordStats.from_json(keyword_stats))
+    else:
+        backlog_response = generate_backlog(project_summary)
     
-    # Generate backlog using agent
-    backlog_response = generate_backlog(project_summary)
+    # Take the write lock up front so record_epic's lookups can't race another writer
+    c.execute("BEGIN IMMEDIATE")
     
     # Save epics to database
     for epic in backlog_response.epics:
         stories_json = json.dumps([{"title": s.title, "story_points": s.story_points, "description": s.description} 
                                    for s in epic.stories])
+        record_epic(c, project_id, epic.title, epic.total_story_points, epic.sprint)
         c.execute('''INSERT INTO epics (project_id, title, stories, total_story_points, sprint, created_at)
                      VALUES (?, ?, ?, ?, ?, ?)''',
                   (project_id, epic.title, stories_json, epic.total_story_points, 
@@ -372,12 +664,15 @@ async def generate_project_backlog(project_id: int):
     
     conn.commit()
     conn.close()
+    invalidate_analytics()
     
     return backlog_response.dict()
 
 @app.get("/projects/{project_id}/backlog")
-async def get_project_backlog(project_id: int):
-    """Get generated backlog for a project"""
+async def get_project_backlog(project_id: int,
+                              offset: int = Query(0, ge=0),
+                              limit: Optional[int] = Query(None, ge=1, le=500)):
+    """Get generated backlog for a project - pass offset/limit to page through epics"""
     conn = get_db_connection()
     c = conn.cursor()
     
@@ -388,13 +683,18 @@ async def get_project_backlog(project_id: int):
         conn.close()
         raise HTTPException(status_code=404, detail="Project not found")
     
+    # Totals cover the whole backlog, even when only one page of epics is returned
+    c.execute("""SELECT COUNT(*), COALESCE(SUM(total_story_points), 0), COALESCE(MAX(sprint), 0)
+                 FROM epics WHERE project_id = ?""", (project_id,))
+    total_epics, total_points, sprints = c.fetchone()
+    
     # Get epics
-    c.execute("SELECT * FROM epics WHERE project_id = ? ORDER BY sprint, id", (project_id,))
+    c.execute("SELECT * FROM epics WHERE project_id = ? ORDER BY sprint, id LIMIT ? OFFSET ?",
+              (project_id, -1 if limit is None else limit, offset))
     epics_rows = c.fetchall()
     conn.close()
     
     epics = []
-    total_points = 0
     
     for row in epics_rows:
         epic_id, proj_id, title, stories_json, story_points, sprint, created_at = row
@@ -408,18 +708,44 @@ async def get_project_backlog(project_id: int):
             "sprint": sprint,
             "created_at": created_at
         })
-        total_points += story_points
     
-    sprints = max([e["sprint"] for e in epics], default=0)
     timeline = f"{sprints * 2} weeks ({sprints} sprints × 2 weeks each)" if sprints > 0 else "Not estimated"
     
     return {
         "epics": epics,
+        "total_epics": total_epics,
         "total_story_points": total_points,
         "estimated_sprints": sprints,
         "timeline_estimate": timeline
     }
 
+@app.get("/analytics")
+def portfolio_analytics():
+    """Portfolio-wide story points per sprint, epic themes and timeline histogram"""
+    return get_portfolio_analytics(get_db_connection)
+
+def require_profiling_admin(request: Request):
+    """Profiles expose internals, so the listing endpoints need the admin token"""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not admin_token_valid(request.headers):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+@app.get("/profiles")
+async def get_profiles(request: Request):
+    """List captured request profiles"""
+    require_profiling_admin(request)
+    return list_profiles(PROFILE_DIR)
+
+@app.get("/profiles/{name}")
+async def download_profile(name: str, request: Request):
+    """Download a captured profile in folded-stack (flamegraph) format"""
+    require_profiling_admin(request)
+    path = profile_path(PROFILE_DIR, name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
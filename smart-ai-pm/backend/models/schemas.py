@@ -19,3 +19,29 @@ class BacklogResponse(BaseModel):
     total_story_points: int
     estimated_sprints: int
     timeline_estimate: str
+
+class SprintRollup(BaseModel):
+    sprint: int
+    epics: int
+    projects: int
+    story_points: int
+
+class ThemeRollup(BaseModel):
+    theme: str
+    epics: int
+    story_points: int
+
+class TimelineBucket(BaseModel):
+    sprints: int
+    weeks: int
+    projects: int
+
+class PortfolioAnalytics(BaseModel):
+    total_projects: int
+    projects_with_backlog: int
+    total_epics: int
+    total_story_points: int
+    story_points_per_sprint: List[SprintRollup]
+    theme_distribution: List[ThemeRollup]
+    timeline_histogram: List[TimelineBucket]
+    generated_at: str
@@ -0,0 +1,146 @@
+import os
+import re
+import sys
+import hmac
+import random
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Profiling is opt-in: nothing below is wired into the app unless this is set
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+# Admin token, sent in the X-Profile-Token header to profile a request or use the /profiles endpoints
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN", "")
+# Fraction of requests profiled automatically (0 disables automatic sampling)
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+# Automatically sampled requests are only kept if they took at least this long
+PROFILING_SLOW_MS = float(os.getenv("PROFILING_SLOW_MS", "1000"))
+# Stack sampling interval
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+# Oldest profiles are deleted once more than this many are kept
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "100"))
+
+PROFILE_SUFFIX = ".folded"
+_PROFILE_NAME_RE = re.compile(r'^[A-Za-z0-9_.-]+\.folded$')
+
+
+class SamplingProfiler:
+    """Statistical profiler for a single thread.
+
+    A background thread periodically snapshots the target thread's stack
+    and counts identical stacks, producing collapsed ("folded") stacks that
+    flamegraph.pl, speedscope and inferno can render directly.
+
+    Async endpoints run on the event loop thread, so concurrent requests on
+    the same loop show up in the same profile.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = PROFILING_INTERVAL_MS / 1000.0):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            # Folded format is root-first, separated by ';'
+            self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Render samples as 'frame;frame;frame count' lines"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def admin_token_valid(headers) -> bool:
+    """Check the X-Profile-Token header against the admin token in constant time"""
+    if not PROFILING_ADMIN_TOKEN:
+        return False
+    token = headers.get("x-profile-token", "")
+    return hmac.compare_digest(token.encode(), PROFILING_ADMIN_TOKEN.encode())
+
+
+def profile_requested(headers, query_params) -> bool:
+    """True if an admin asked for this request to be profiled.
+
+    The X-Profile: 1 header or ?profile=1 flag selects the request; the token
+    itself only ever travels in a header so it stays out of access logs.
+    """
+    flagged = headers.get("x-profile") == "1" or query_params.get("profile") == "1"
+    return flagged and admin_token_valid(headers)
+
+
+def sample_request() -> bool:
+    """Pick requests for automatic slow-request profiling"""
+    return PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE
+
+
+def write_profile(profile_dir: Path, profiler: SamplingProfiler, method: str, path: str, elapsed_ms: float) -> Optional[str]:
+    """Write a captured profile to profile_dir, returns the file name.
+
+    Requests that finished before the first sample have nothing to show,
+    so no file is written and None is returned.
+    """
+    if not profiler.samples:
+        return None
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', path).strip('-') or "root"
+    name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{method.lower()}_{slug}_{int(elapsed_ms)}ms{PROFILE_SUFFIX}"
+    (profile_dir / name).write_text(profiler.folded())
+    prune_profiles(profile_dir)
+    return name
+
+
+def prune_profiles(profile_dir: Path, max_files: int = PROFILING_MAX_FILES):
+    """Delete the oldest profiles beyond max_files"""
+    # Names start with a timestamp, so they sort oldest first
+    names = sorted(entry.name for entry in profile_dir.iterdir()
+                   if entry.is_file() and entry.suffix == PROFILE_SUFFIX)
+    for name in names[:max(0, len(names) - max_files)]:
+        (profile_dir / name).unlink(missing_ok=True)
+
+
+def list_profiles(profile_dir: Path) -> List[Dict]:
+    """List captured profiles, newest first"""
+    if not profile_dir.exists():
+        return []
+    profiles = []
+    for entry in profile_dir.iterdir():
+        if entry.is_file() and entry.suffix == PROFILE_SUFFIX:
+            stat = entry.stat()
+            profiles.append({
+                "name": entry.name,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
+    profiles.sort(key=lambda p: p["name"], reverse=True)
+    return profiles
+
+
+def profile_path(profile_dir: Path, name: str) -> Optional[Path]:
+    """Resolve a profile file name, rejecting anything outside profile_dir"""
+    if not _PROFILE_NAME_RE.match(name):
+        return None
+    path = profile_dir / name
+    return path if path.is_file() else None
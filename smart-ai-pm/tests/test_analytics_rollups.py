@@ -0,0 +1,116 @@
+import sys
+import random
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent / "backend"
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import main
+from analytics.portfolio import init_rollups, record_epic, compute_portfolio_analytics
+
+ROLLUP_QUERIES = {
+    "rollup_sprints": "SELECT sprint, epics, projects, story_points FROM rollup_sprints ORDER BY sprint",
+    "rollup_themes": "SELECT title, epics, story_points FROM rollup_themes ORDER BY title",
+    "rollup_timeline": "SELECT sprints, projects FROM rollup_timeline ORDER BY sprints",
+}
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_DIR", tmp_path)
+    monkeypatch.setattr(main, "DB_PATH", tmp_path / "smart_pm.db")
+    main.init_db()
+    conn = main.get_db_connection()
+    yield conn
+    conn.close()
+
+
+def snapshot(conn):
+    return {table: conn.execute(query).fetchall() for table, query in ROLLUP_QUERIES.items()}
+
+
+def insert_epic(c, project_id, title, story_points, sprint):
+    record_epic(c, project_id, title, story_points, sprint)
+    c.execute('''INSERT INTO epics (project_id, title, stories, total_story_points, sprint, created_at)
+                 VALUES (?, ?, '[]', ?, ?, '')''', (project_id, title, story_points, sprint))
+
+
+def backfilled(conn):
+    for table in ROLLUP_QUERIES:
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+    init_rollups(conn)
+    return snapshot(conn)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_rollups_match_backfill(conn, seed):
+    rng = random.Random(seed)
+    titles = ["Core Functionality", "Integration & APIs", "User Interface & UX", None]
+    c = conn.cursor()
+    for _ in range(30):
+        # Write in batches, like generate_project_backlog does
+        c.execute("BEGIN IMMEDIATE")
+        for _ in range(rng.randint(1, 6)):
+            insert_epic(c, rng.randint(1, 12), rng.choice(titles),
+                        rng.choice([None, 0, 1, 3, 5, 8]), rng.choice([None, 1, 2, 3, 4, 7]))
+        conn.commit()
+
+    incremental = snapshot(conn)
+    assert incremental == backfilled(conn)
+
+
+def test_analytics_totals_come_from_rollups(conn):
+    c = conn.cursor()
+    c.execute("BEGIN IMMEDIATE")
+    insert_epic(c, 1, "Core Functionality", 5, 1)
+    insert_epic(c, 1, "Core Functionality", 3, 4)
+    insert_epic(c, 2, None, None, None)
+    conn.commit()
+
+    analytics = compute_portfolio_analytics(conn)
+    assert analytics.total_epics == 3
+    assert analytics.total_story_points == 8
+    assert analytics.projects_with_backlog == 2
+    assert [(b.sprints, b.weeks, b.projects) for b in analytics.timeline_histogram] == [(0, 0, 1), (4, 8, 1)]
+
+
+def test_concurrent_backfill_runs_once(conn):
+    c = conn.cursor()
+    c.execute("BEGIN IMMEDIATE")
+    for project_id in range(1, 50):
+        insert_epic(c, project_id, "Core Functionality", 5, project_id % 4 + 1)
+    conn.commit()
+    expected = backfilled(conn)
+    for table in ROLLUP_QUERIES:
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+
+    # Several workers starting at once against a database that needs backfilling
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def worker():
+        worker_conn = sqlite3.connect(str(main.DB_PATH), timeout=10)
+        try:
+            barrier.wait()
+            init_rollups(worker_conn)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            worker_conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert snapshot(conn) == expected
@@ -0,0 +1,74 @@
+import sys
+import random
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent / "backend"
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from agents import backlog_agent
+from agents.backlog_agent import KeywordAccumulator, KeywordStats, generate_backlog_from_stats
+
+
+def make_document(seed: int, words: int = 5000) -> str:
+    rng = random.Random(seed)
+    vocab = ["login", "users", "account", "payment", "checkout", "product", "search", "database",
+             "machine", "learning", "chatbot", "message", "feature", "modules", "system", "the", "and"]
+    vocab += ["".join(rng.choice("bcdfgjkqvwxz") for _ in range(rng.randint(2, 9))) for _ in range(200)]
+    separators = [" ", "  ", "\n", ", ", ". ", "-", "_", "42", "é"]
+    parts = []
+    for _ in range(words):
+        word = rng.choice(vocab)
+        parts.append(word.capitalize() if rng.random() < 0.2 else word)
+        # Occasionally glue words together so long and mixed tokens cross chunk boundaries too
+        if rng.random() < 0.9:
+            parts.append(rng.choice(separators))
+    return "".join(parts)
+
+
+def accumulate(text: str, chunk_size: int) -> KeywordStats:
+    accumulator = KeywordAccumulator()
+    for i in range(0, len(text), chunk_size):
+        accumulator.feed(text[i:i + chunk_size])
+    return accumulator.finish()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16, 17, 64, 999, 4096])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_chunked_input_matches_unchunked(seed, chunk_size):
+    text = make_document(seed)
+    whole = KeywordStats.from_text(text)
+    chunked = accumulate(text, chunk_size)
+
+    # Same counts in the same first-seen order, so frequency ties rank identically
+    assert list(chunked.counts.items()) == list(whole.counts.items())
+    assert chunked.epic_names() == whole.epic_names()
+    assert generate_backlog_from_stats(chunked).dict() == generate_backlog_from_stats(whole).dict()
+
+
+@pytest.mark.parametrize("chunk_size", [5, 64])
+def test_raw_vocabulary_flushes_keep_counts_exact(monkeypatch, chunk_size):
+    text = make_document(5)
+    whole = KeywordStats.from_text(text)
+    monkeypatch.setattr(backlog_agent, "RAW_VOCABULARY_LIMIT", 10)
+    chunked = accumulate(text, chunk_size)
+    assert list(chunked.counts.items()) == list(whole.counts.items())
+
+
+def test_template_match_spanning_chunks():
+    stats = accumulate("we train a machine learning pipeline", 13)
+    assert stats.epic_names()[0] == "Data Pipeline & Processing"
+
+
+def test_only_candidate_words_are_counted():
+    stats = KeywordStats.from_text("Login login zzzz qwerty systems account")
+    assert dict(stats.counts) == {"login": 2, "systems": 1, "account": 1}
+
+
+def test_json_round_trip_preserves_backlog():
+    stats = KeywordStats.from_text(make_document(4))
+    restored = KeywordStats.from_json(stats.to_json())
+    assert generate_backlog_from_stats(restored).dict() == generate_backlog_from_stats(stats).dict()
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent / "backend"
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import main
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_DIR", tmp_path)
+    monkeypatch.setattr(main, "DB_PATH", tmp_path / "smart_pm.db")
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_projects_offset_applies_without_limit(client):
+    ids = [client.post("/projects", json={"name": f"p{i}", "summary": "web app"}).json()["id"] for i in range(5)]
+    newest_first = list(reversed(ids))
+
+    assert [p["id"] for p in client.get("/projects").json()] == newest_first
+    assert [p["id"] for p in client.get("/projects?offset=2").json()] == newest_first[2:]
+    res = client.get("/projects?offset=1&limit=2")
+    assert [p["id"] for p in res.json()] == newest_first[1:3]
+    assert res.headers["X-Total-Count"] == "5"
+
+
+def test_backlog_offset_applies_without_limit(client):
+    project_id = client.post("/projects", json={"name": "p", "summary": "ecommerce shop"}).json()["id"]
+    client.post(f"/generate-backlog/{project_id}")
+
+    full = client.get(f"/projects/{project_id}/backlog").json()
+    rest = client.get(f"/projects/{project_id}/backlog?offset=1").json()
+    assert [e["id"] for e in rest["epics"]] == [e["id"] for e in full["epics"]][1:]
+    # Totals always cover the whole backlog
+    assert rest["total_epics"] == full["total_epics"] == 4
+    assert rest["total_story_points"] == full["total_story_points"]
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent / "backend"
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from profiling import sampler
+from profiling.sampler import (
+    SamplingProfiler, admin_token_valid, profile_requested, profile_path, write_profile
+)
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(sampler, "PROFILING_ADMIN_TOKEN", "s3cret")
+    return "s3cret"
+
+
+def test_admin_token_checks_header(admin_token):
+    assert admin_token_valid({"x-profile-token": admin_token})
+    assert not admin_token_valid({"x-profile-token": "wrong"})
+    assert not admin_token_valid({"x-profile-token": admin_token + "x"})
+    assert not admin_token_valid({})
+
+
+def test_admin_token_disabled_without_configured_token(monkeypatch):
+    monkeypatch.setattr(sampler, "PROFILING_ADMIN_TOKEN", "")
+    assert not admin_token_valid({"x-profile-token": ""})
+
+
+def test_profile_requested_needs_flag_and_header_token(admin_token):
+    headers = {"x-profile-token": admin_token}
+    assert profile_requested(headers, {"profile": "1"})
+    assert profile_requested({**headers, "x-profile": "1"}, {})
+    assert not profile_requested(headers, {})
+    # The token is never accepted from the URL
+    assert not profile_requested({}, {"profile": admin_token})
+    assert not profile_requested({"x-profile-token": "wrong"}, {"profile": "1"})
+
+
+def test_profile_path_rejects_names_outside_profile_dir(tmp_path):
+    profile_dir = tmp_path / "profiles"
+    profile_dir.mkdir()
+    (profile_dir / "20260101T000000_get_root_1ms.folded").write_text("main 1\n")
+    (tmp_path / "secret.folded").write_text("x")
+
+    assert profile_path(profile_dir, "20260101T000000_get_root_1ms.folded") == \
+        profile_dir / "20260101T000000_get_root_1ms.folded"
+    for name in ["../secret.folded", "..%2Fsecret.folded", "sub/x.folded", "/etc/passwd",
+                 "20260101T000000_get_root_1ms.txt", "missing.folded", ""]:
+        assert profile_path(profile_dir, name) is None
+
+
+def test_write_profile_skips_empty_profiles(tmp_path):
+    profiler = SamplingProfiler()
+    assert write_profile(tmp_path, profiler, "GET", "/projects", 1.0) is None
+    assert list(tmp_path.iterdir()) == []
+
+    profiler.samples["main (main.py:1);handler (main.py:2)"] += 3
+    name = write_profile(tmp_path, profiler, "GET", "/projects", 1.0)
+    assert (tmp_path / name).read_text() == "main (main.py:1);handler (main.py:2) 3\n"